@@ -7,13 +7,13 @@ These endpoints are used for CRUD operations on databases.
 from datetime import datetime, timezone
 from uuid import uuid4
 
-import aiosqlite
-from quart import Blueprint, current_app, url_for
+from quart import Blueprint, url_for
 from quart_schema import validate_request, validate_response
 
 from byodb.constants import DialectEnum
-from byodb.db import get_db
+from byodb.db import get_db, get_writer
 from byodb.errors import ErrorHeaders, ErrorResponse, FullErrorResponse
+from byodb.pool import get_pools
 
 from .models import (
     Database,
@@ -51,7 +51,7 @@ async def create_database(data: DatabaseCreate) -> tuple[DatabaseResponse, int]:
     uuid = data.uuid or uuid4()
     created_at = last_modified_at = datetime.now(timezone.utc)
 
-    async with aiosqlite.connect(current_app.config["DATABASE"]) as db:
+    async with get_writer() as db:
         await db.execute(
             "INSERT INTO database "
             "(uuid, dialect, name, description, created_at, last_modified_at) "
@@ -115,7 +115,7 @@ async def update_database(
     """
     Update an existing database.
     """
-    async with get_db() as db:
+    async with get_writer() as db:
         async with db.execute(
             "SELECT * FROM database WHERE uuid = ?",
             (uuid,),
@@ -160,13 +160,16 @@ async def delete_database(
     """
     Delete a given database.
     """
-    async with aiosqlite.connect(current_app.config["DATABASE"]) as db:
-        await db.execute(
+    async with get_writer() as db:
+        async with db.execute(
             "DELETE FROM database WHERE uuid = ?",
             (uuid,),
-        )
+        ) as cursor:
+            affected_rows = cursor.rowcount
         await db.commit()
-        affected_rows = db.total_changes
+
+    if affected_rows:
+        await get_pools().discard(uuid)
 
     if affected_rows == 1:
         return DatabaseDeletedResponse(result="OK"), 204
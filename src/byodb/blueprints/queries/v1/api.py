@@ -3,14 +3,13 @@ Queries blueprint.
 """
 
 from datetime import datetime, timezone
-from pathlib import Path
 
-import aiosqlite
-from quart import Blueprint, current_app, url_for
+from quart import Blueprint, url_for
 from quart_schema import validate_request, validate_response
 
 from byodb.db import get_db
 from byodb.errors import ErrorHeaders, ErrorResponse, FullErrorResponse
+from byodb.pool import get_pools
 
 from .models import Query, QueryCreate, QueryResponse, QueryResults
 
@@ -56,8 +55,7 @@ async def create_query(
             ErrorHeaders(content_type="application/problem+json"),
         )
 
-    path = Path(current_app.config["STORAGE"]) / uuid
-    async with aiosqlite.connect(path) as db:
+    async with get_pools().connection(uuid) as db:
         started = datetime.now(timezone.utc)
         async with db.execute(data.submitted_query) as cursor:
             rows = await cursor.fetchall()
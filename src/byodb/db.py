@@ -2,17 +2,117 @@
 DB-related functions.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import AsyncIterator
 
 import aiosqlite
-from quart import current_app
+from quart import Quart, current_app
+
+from byodb.pool import ConnectionPool
+
+
+class MetadataDatabase:
+    """
+    Long-lived connections to the metadata database.
+
+    Reads are served from a pool of connections, so they can run concurrently. SQLite
+    only allows one writer at a time, so writes go through a single connection that is
+    handed out to one request at a time.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        size: int,
+        idle_timeout: float,
+        health_check_interval: float,
+    ) -> None:
+        self.path = path
+        self.readers = ConnectionPool(
+            path,
+            size,
+            idle_timeout,
+            health_check_interval,
+            row_factory=aiosqlite.Row,
+        )
+
+        self._writer: aiosqlite.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """
+        Open the writer connection.
+        """
+        self._writer = await aiosqlite.connect(self.path)
+        self._writer.row_factory = aiosqlite.Row
+
+    async def close(self) -> None:
+        """
+        Close all connections.
+        """
+        await self.readers.close()
+        if self._writer:
+            with suppress(sqlite3.Error, ValueError):
+                await self._writer.close()
+            self._writer = None
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Context manager that borrows a read connection.
+        """
+        async with self.readers.connection() as db:
+            yield db
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Context manager that holds the writer connection exclusively.
+
+        Uncommitted changes are rolled back when the context exits.
+        """
+        if self._writer is None:
+            raise RuntimeError("The metadata database has not been started")
+
+        async with self._lock:
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+
+
+def init_app(app: Quart) -> None:
+    """
+    Attach the metadata database to the app.
+    """
+    metadata = MetadataDatabase(
+        app.config["DATABASE"],
+        size=int(app.config["METADATA_POOL_SIZE"]),
+        idle_timeout=float(app.config["POOL_IDLE_TIMEOUT"]),
+        health_check_interval=float(app.config["POOL_HEALTH_CHECK_INTERVAL"]),
+    )
+    app.extensions["metadata"] = metadata
+    app.before_serving(metadata.start)
+    app.after_serving(metadata.close)
+
+
+@asynccontextmanager
+async def get_db() -> AsyncIterator[aiosqlite.Connection]:
+    """
+    Context manager for a read connection with a row factory.
+    """
+    async with current_app.extensions["metadata"].reader() as db:
+        yield db
 
 
 @asynccontextmanager
-async def get_db() -> aiosqlite.Connection:
+async def get_writer() -> AsyncIterator[aiosqlite.Connection]:
     """
-    Context manager for a DB connection with a row factory.
+    Context manager for the writer connection, with a row factory.
     """
-    async with aiosqlite.connect(current_app.config["DATABASE"]) as db:
-        db.row_factory = aiosqlite.Row
+    async with current_app.extensions["metadata"].writer() as db:
         yield db
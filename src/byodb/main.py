@@ -10,6 +10,7 @@ from dotenv import dotenv_values
 from quart import Quart
 from quart_schema import QuartSchema
 
+from byodb import db, pool
 from byodb.blueprints.databases.v1 import api as databases_v1
 from byodb.blueprints.queries.v1 import api as queries_v1
 
@@ -23,12 +24,15 @@ def create_app(test_config: dict[str, str] | None = None) -> Quart:
     app = Quart(__name__)
 
     # configuration
+    app.config.from_object("byodb.settings")
     app.config.update(dotenv_values(".env"))
     if test_config:
         app.config.from_mapping(test_config)
 
     # extensions
     quart_schema.init_app(app)
+    db.init_app(app)
+    pool.init_app(app)
 
     # blueprints
     app.register_blueprint(databases_v1.blueprint)
@@ -41,10 +45,10 @@ async def init_db(app: Quart) -> None:
     """
     Create tables.
     """
-    async with aiosqlite.connect(app.config["DATABASE"]) as db:
+    async with aiosqlite.connect(app.config["DATABASE"]) as connection:
         with open(Path(app.root_path) / "schema.sql", encoding="utf-8") as file_:
-            await db.executescript(file_.read())
-        await db.commit()
+            await connection.executescript(file_.read())
+        await connection.commit()
 
 
 def init_db_sync():
@@ -0,0 +1,325 @@
+"""
+Connection pools for storage databases.
+
+Opening a connection with `aiosqlite` starts a worker thread, opens the file, and forces
+SQLite to read the schema on the first query. Doing that on every request is often more
+expensive than running the query itself, so connections are kept open and reused.
+"""
+
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+import aiosqlite
+from quart import Quart, current_app
+
+
+class ConnectionPool:
+    """
+    A pool of connections to a single SQLite database.
+
+    Connections are created lazily, up to `size`, and handed out in LIFO order so that
+    the hottest connections are reused and the others can expire. Connections idle for
+    longer than `idle_timeout` seconds are closed, and connections idle for longer than
+    `health_check_interval` seconds are pinged before being reused.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: Path | str,
+        size: int,
+        idle_timeout: float,
+        health_check_interval: float,
+        row_factory: type | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.path = path
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.row_factory = row_factory
+        self.kwargs = kwargs
+
+        self.last_used = time.monotonic()
+
+        self._idle: list[tuple[aiosqlite.Connection, float]] = []
+        self._semaphore = asyncio.Semaphore(size)
+        self._users = 0
+        self._closed = False
+
+    @property
+    def busy(self) -> bool:
+        """
+        Is the pool being used?
+        """
+        return self._users > 0
+
+    @property
+    def idle_connections(self) -> int:
+        """
+        Number of idle connections kept open by the pool.
+        """
+        return len(self._idle)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Context manager that borrows a connection from the pool.
+        """
+        self._users += 1
+        self.last_used = time.monotonic()
+        try:
+            async with self._semaphore:
+                connection = await self._get_idle() or await self._connect()
+                try:
+                    yield connection
+                finally:
+                    await self._release(connection)
+        finally:
+            self._users -= 1
+            self.last_used = time.monotonic()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """
+        Open a new connection to the database.
+        """
+        connection = await aiosqlite.connect(self.path, **self.kwargs)
+        connection.row_factory = self.row_factory
+
+        return connection
+
+    async def _get_idle(self) -> aiosqlite.Connection | None:
+        """
+        Return a healthy idle connection, if any.
+        """
+        now = time.monotonic()
+        while self._idle:
+            connection, released = self._idle.pop()
+            idle = now - released
+            if idle > self.idle_timeout or (
+                idle > self.health_check_interval
+                and not await self._is_healthy(connection)
+            ):
+                await self._close(connection)
+                continue
+
+            return connection
+
+        return None
+
+    async def _release(self, connection: aiosqlite.Connection) -> None:
+        """
+        Return a connection to the pool, leaving it in a clean state.
+        """
+        if self._closed:
+            await self._close(connection)
+            return
+
+        try:
+            if connection.in_transaction:
+                await connection.rollback()
+        except (sqlite3.Error, ValueError):
+            await self._close(connection)
+            return
+
+        self._idle.append((connection, time.monotonic()))
+
+    @staticmethod
+    async def _is_healthy(connection: aiosqlite.Connection) -> bool:
+        """
+        Check that a connection can still run queries.
+        """
+        try:
+            await connection.execute("SELECT 1")
+        except (sqlite3.Error, ValueError):
+            return False
+
+        return True
+
+    @staticmethod
+    async def _close(connection: aiosqlite.Connection) -> None:
+        """
+        Close a connection, ignoring errors from broken connections.
+        """
+        with suppress(sqlite3.Error, ValueError):
+            await connection.close()
+
+    async def prune(self) -> None:
+        """
+        Close connections that have been idle for too long.
+        """
+        now = time.monotonic()
+        expired = [
+            connection
+            for connection, released in self._idle
+            if now - released > self.idle_timeout
+        ]
+        self._idle = [
+            (connection, released)
+            for connection, released in self._idle
+            if now - released <= self.idle_timeout
+        ]
+        for connection in expired:
+            await self._close(connection)
+
+    async def close(self) -> None:
+        """
+        Close all idle connections; busy connections are closed when released.
+        """
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            await self._close(connection)
+
+
+class PoolManager:
+    """
+    Pools of connections to storage databases, keyed by database UUID.
+
+    To serve thousands of databases without running out of file descriptors the number
+    of pools is capped, and when the cap is reached the least recently used pools that
+    are not busy are closed.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        storage: Path | str,
+        size: int,
+        idle_timeout: float,
+        health_check_interval: float,
+        max_pools: int,
+    ) -> None:
+        self.storage = Path(storage)
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.max_pools = max_pools
+
+        self._pools: OrderedDict[str, ConnectionPool] = OrderedDict()
+        self._reaper: asyncio.Task | None = None
+        self._closing: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def get_pool(self, uuid: UUID | str) -> ConnectionPool:
+        """
+        Return the pool for a given database, creating it if needed.
+        """
+        key = str(uuid)
+        if key in self._pools:
+            self._pools.move_to_end(key)
+            return self._pools[key]
+
+        pool = ConnectionPool(
+            self.storage / key,
+            self.size,
+            self.idle_timeout,
+            self.health_check_interval,
+        )
+        self._pools[key] = pool
+        self._evict()
+
+        return pool
+
+    @asynccontextmanager
+    async def connection(self, uuid: UUID | str) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Context manager that borrows a connection to a given database.
+        """
+        async with self.get_pool(uuid).connection() as connection:
+            yield connection
+
+    def _evict(self) -> None:
+        """
+        Close the least recently used pools until we're under the limit.
+        """
+        excess = len(self._pools) - self.max_pools
+        for key, pool in list(self._pools.items()):
+            if excess <= 0:
+                break
+            if pool.busy:
+                continue
+
+            del self._pools[key]
+            task = asyncio.create_task(pool.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+            excess -= 1
+
+    async def discard(self, uuid: UUID | str) -> None:
+        """
+        Close and drop the pool for a given database.
+        """
+        pool = self._pools.pop(str(uuid), None)
+        if pool:
+            await pool.close()
+
+    async def prune(self) -> None:
+        """
+        Close expired connections, and drop pools that have been idle for too long.
+        """
+        now = time.monotonic()
+        for key, pool in list(self._pools.items()):
+            await pool.prune()
+            if not pool.busy and now - pool.last_used > self.idle_timeout:
+                self._pools.pop(key, None)
+                await pool.close()
+
+    async def _reap(self) -> None:
+        """
+        Periodically prune idle connections.
+        """
+        while True:
+            await asyncio.sleep(self.idle_timeout)
+            await self.prune()
+
+    async def start(self) -> None:
+        """
+        Start the background task that prunes idle connections.
+        """
+        self._reaper = asyncio.create_task(self._reap())
+
+    async def close(self) -> None:
+        """
+        Close all pools.
+        """
+        if self._reaper:
+            self._reaper.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reaper
+            self._reaper = None
+
+        pools, self._pools = self._pools, OrderedDict()
+        for pool in pools.values():
+            await pool.close()
+        if self._closing:
+            await asyncio.gather(*self._closing)
+
+
+def init_app(app: Quart) -> None:
+    """
+    Attach a pool manager for storage databases to the app.
+    """
+    manager = PoolManager(
+        storage=app.config["STORAGE"],
+        size=int(app.config["POOL_SIZE"]),
+        idle_timeout=float(app.config["POOL_IDLE_TIMEOUT"]),
+        health_check_interval=float(app.config["POOL_HEALTH_CHECK_INTERVAL"]),
+        max_pools=int(app.config["POOL_MAX_DATABASES"]),
+    )
+    app.extensions["pools"] = manager
+    app.before_serving(manager.start)
+    app.after_serving(manager.close)
+
+
+def get_pools() -> PoolManager:
+    """
+    Return the pool manager for the current app.
+    """
+    return current_app.extensions["pools"]
@@ -0,0 +1,23 @@
+"""
+Default settings for BYODB.
+
+These can be overridden in the `.env` file or, for tests, in the mapping passed to
+`create_app`. Note that values read from `.env` are strings, so they should be cast
+when read.
+"""
+
+# maximum number of connections kept open for each storage database
+POOL_SIZE = 5
+
+# seconds before an idle connection is closed
+POOL_IDLE_TIMEOUT = 300
+
+# seconds of inactivity after which a connection is checked before being reused
+POOL_HEALTH_CHECK_INTERVAL = 30
+
+# maximum number of storage databases with an open pool; least recently used pools are
+# closed when the limit is reached
+POOL_MAX_DATABASES = 1000
+
+# maximum number of read connections to the metadata database
+METADATA_POOL_SIZE = 5
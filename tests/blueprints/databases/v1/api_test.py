@@ -187,12 +187,15 @@ async def test_delete_database_multiple_primary_keys(
 
     This should never happen. I don't know why I'm writing this test.
     """
-    connection = mocker.AsyncMock()
-    db = mocker.AsyncMock()
-    db.total_changes = 2
+    cursor = mocker.MagicMock()
+    cursor.rowcount = 2
+    db = mocker.MagicMock()
+    db.execute().__aenter__.return_value = cursor
+    db.commit = mocker.AsyncMock()
+    connection = mocker.MagicMock()
     connection.__aenter__.return_value = db
     mocker.patch(
-        "byodb.blueprints.databases.v1.api.aiosqlite.connect",
+        "byodb.blueprints.databases.v1.api.get_writer",
         return_value=connection,
     )
 
@@ -25,7 +25,8 @@ async def app(tmpdir) -> Quart:
     if not tmpdir.join("storage").exists():
         tmpdir.join("storage").mkdir()
 
-    yield test_app
+    async with test_app.test_app():
+        yield test_app
 
 
 @pytest.fixture
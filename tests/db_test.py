@@ -0,0 +1,86 @@
+"""
+Tests for the metadata database.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from byodb.db import MetadataDatabase
+
+
+async def test_metadata_database(tmp_path: Path) -> None:
+    """
+    Test reading and writing through the metadata database.
+    """
+    metadata = MetadataDatabase(tmp_path / "byodb.sqlite", 2, 60, 30)
+    await metadata.start()
+
+    async with metadata.writer() as db:
+        await db.execute("CREATE TABLE t (a INT)")
+        await db.execute("INSERT INTO t (a) VALUES (1)")
+        await db.commit()
+
+    async with metadata.reader() as db:
+        async with db.execute("SELECT a FROM t") as cursor:
+            row = await cursor.fetchone()
+    assert row["a"] == 1
+
+    await metadata.close()
+
+
+async def test_metadata_database_writer_rollback(tmp_path: Path) -> None:
+    """
+    Test that uncommitted writes are rolled back.
+    """
+    metadata = MetadataDatabase(tmp_path / "byodb.sqlite", 2, 60, 30)
+    await metadata.start()
+
+    async with metadata.writer() as db:
+        await db.execute("CREATE TABLE t (a INT)")
+        await db.commit()
+
+    with pytest.raises(ZeroDivisionError):
+        async with metadata.writer() as db:
+            await db.execute("INSERT INTO t (a) VALUES (1)")
+            raise ZeroDivisionError()
+
+    async with metadata.reader() as db:
+        async with db.execute("SELECT COUNT(*) FROM t") as cursor:
+            assert await cursor.fetchone() == (0,)
+
+    await metadata.close()
+
+
+async def test_metadata_database_writer_is_exclusive(tmp_path: Path) -> None:
+    """
+    Test that only one request holds the writer at a time.
+    """
+    metadata = MetadataDatabase(tmp_path / "byodb.sqlite", 2, 60, 30)
+    await metadata.start()
+
+    active = []
+
+    async def write() -> None:
+        async with metadata.writer():
+            active.append(1)
+            assert len(active) == 1
+            await asyncio.sleep(0)
+            active.pop()
+
+    await asyncio.gather(*(write() for _ in range(5)))
+
+    await metadata.close()
+
+
+async def test_metadata_database_not_started(tmp_path: Path) -> None:
+    """
+    Test that the writer can't be used before the database is started.
+    """
+    metadata = MetadataDatabase(tmp_path / "byodb.sqlite", 2, 60, 30)
+
+    with pytest.raises(RuntimeError) as excinfo:
+        async with metadata.writer():
+            pass
+    assert str(excinfo.value) == "The metadata database has not been started"
@@ -0,0 +1,143 @@
+"""
+Tests for the connection pools.
+"""
+
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+from quart import Quart
+
+from byodb.pool import ConnectionPool, PoolManager, get_pools
+
+
+async def test_connection_pool_reuses_connections(tmp_path: Path) -> None:
+    """
+    Test that connections are reused.
+    """
+    pool = ConnectionPool(tmp_path / "test.db", 2, 60, 30)
+
+    async with pool.connection() as connection:
+        assert pool.busy
+        first = connection
+    assert not pool.busy
+    assert pool.idle_connections == 1
+
+    async with pool.connection() as connection:
+        assert connection is first
+
+    await pool.close()
+    assert pool.idle_connections == 0
+
+
+async def test_connection_pool_rolls_back(tmp_path: Path) -> None:
+    """
+    Test that open transactions are rolled back when a connection is released.
+    """
+    pool = ConnectionPool(tmp_path / "test.db", 1, 60, 30)
+
+    async with pool.connection() as connection:
+        await connection.execute("CREATE TABLE t (a INT)")
+        await connection.commit()
+        await connection.execute("INSERT INTO t (a) VALUES (1)")
+        assert connection.in_transaction
+
+    async with pool.connection() as connection:
+        assert not connection.in_transaction
+        async with connection.execute("SELECT COUNT(*) FROM t") as cursor:
+            assert await cursor.fetchone() == (0,)
+
+    await pool.close()
+
+
+async def test_connection_pool_idle_timeout(tmp_path: Path) -> None:
+    """
+    Test that expired connections are not reused.
+    """
+    pool = ConnectionPool(tmp_path / "test.db", 1, 0, 0)
+
+    async with pool.connection() as connection:
+        first = connection
+
+    async with pool.connection() as connection:
+        assert connection is not first
+
+    await pool.prune()
+    assert pool.idle_connections == 0
+
+    await pool.close()
+
+
+async def test_connection_pool_health_check(
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    """
+    Test that unhealthy connections are replaced.
+    """
+    pool = ConnectionPool(tmp_path / "test.db", 1, 60, 0)
+
+    async with pool.connection() as connection:
+        first = connection
+
+    mocker.patch.object(ConnectionPool, "_is_healthy", return_value=False)
+    async with pool.connection() as connection:
+        assert connection is not first
+
+    await pool.close()
+
+
+async def test_pool_manager_evicts_lru(tmp_path: Path) -> None:
+    """
+    Test that the least recently used pools are evicted.
+    """
+    manager = PoolManager(tmp_path, 1, 60, 30, 2)
+
+    async with manager.connection("a"):
+        pass
+    async with manager.connection("b"):
+        pass
+    async with manager.connection("a"):
+        pass
+    async with manager.connection("c"):
+        pass
+
+    assert len(manager) == 2
+    assert manager.get_pool("a").idle_connections == 1
+
+    await manager.discard("a")
+    assert len(manager) == 1
+
+    await manager.close()
+    assert len(manager) == 0
+
+
+async def test_delete_database_discards_pool(current_app: Quart) -> None:
+    """
+    Test that deleting a database closes its pool.
+    """
+    test_client = current_app.test_client()
+
+    await test_client.post(
+        "/api/databases/v1/",
+        json={
+            "dialect": "sqlite",
+            "name": "test_db",
+            "description": "A simple database",
+            "uuid": "92cdeabd-8278-43ad-871d-0214dcb2d12e",
+        },
+    )
+    await test_client.post(
+        "/api/queries/v1/",
+        json={
+            "database_uuid": "92cdeabd-8278-43ad-871d-0214dcb2d12e",
+            "submitted_query": "SELECT 42",
+        },
+    )
+
+    async with current_app.app_context():
+        assert len(get_pools()) == 1
+
+    await test_client.delete("/api/databases/v1/92cdeabd-8278-43ad-871d-0214dcb2d12e")
+
+    async with current_app.app_context():
+        assert len(get_pools()) == 0